@@ -8,38 +8,95 @@ Requirements:
 - python-dotenv
 - twilio
 - flask
+- waitress
 - customtkinter
+- tiktoken (optional, for exact token counts)
 """
 
 import openai
 import os
 import json
-import tkinter as tk
-from tkinter import messagebox, scrolledtext
-import customtkinter as ctk
-from datetime import datetime
 from dotenv import load_dotenv
 from flask import Flask, request
+from waitress import create_server, wasyncore
 from twilio.twiml.messaging_response import MessagingResponse
-from twilio.rest import Client
 import threading
 import traceback
 import time
 import queue
+import atexit
+import hashlib
+from collections import deque, OrderedDict
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # Fall back to estimating tokens from length
 
 # Load environment variables
 load_dotenv()
 
+# Twilio credentials never change after startup
+TWILIO_SID = os.getenv("TWILIO_ACCOUNT_SID")
+TWILIO_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
+
 DEFAULT_CONFIG = {
     "model": "gpt-3.5-turbo",
     "temperature": 0.7,
     "max_tokens": 1000,
     "api_key": "",  
     "server_port": 5000,
+    "request_timeout": 15,  # Seconds; Twilio gives up on the webhook after 15
     "appearance_mode": "dark"  # "dark" or "light"
 }
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "whatsapp_bot_config.json")
+USER_DETAILS_FILE = os.path.join(os.path.dirname(__file__), "user_details.json")
+USER_DETAILS_LOG = os.path.join(os.path.dirname(__file__), "user_details.jsonl")
+
+# Worker threads for the WSGI server; each webhook blocks on the OpenAI call
+SERVER_THREADS = max(16, 4 * (os.cpu_count() or 1))
+
+NAME_CACHE_SIZE = 1024  # Resolved user names kept in memory
+MAX_PENDING_PER_USER = 3  # Messages per user processing or queued; more are turned away
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful assistant responding via WhatsApp."}
+MAX_HISTORY = 20  # Messages kept per user, including the system message
+
+# Context window sizes in tokens, used to budget the prompt
+MODEL_CTX = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo-preview": 128000
+}
+DEFAULT_CTX = 4096
+SUMMARY_PREFIX = "Earlier summary: "
+SUMMARY_EVERY = 10  # Evicted messages folded into each summary
+SUMMARY_CHARS = 400
+TOKEN_CACHE_SIZE = 4096  # Cached token counts per message content
+ENCODING_RETRY_BASE = 5  # Seconds before retrying a failed tiktoken load, doubling
+ENCODING_RETRY_MAX = 300
+RESPONSE_CACHE_SIZE = 512
+RESPONSE_CACHE_MAX_HISTORY = 3  # Only cache conversations short enough to key on entirely
+
+HELP_TEXT = (
+    "WhatsApp OpenAI Bot Help:\n"
+    "- !clear: Clear conversation history\n"
+    "- !help: Show this help message\n"
+    "- !info: Show current bot configuration\n"
+    "Just type a message to chat with the AI assistant!"
+)
+
+BUSY_TEXT = "⏳ Still working on your earlier messages. Please try again in a moment."
+
+INFO_TEMPLATE = (
+    "Bot Configuration:\n"
+    "- Model: {model}\n"
+    "- Temperature: {temperature}\n"
+    "- Max tokens: {max_tokens}"
+)
 
 def load_config():
     """Load configuration from file or create default if not exists"""
@@ -53,26 +110,96 @@ def load_config():
     save_config(DEFAULT_CONFIG)
     return DEFAULT_CONFIG.copy()
 
+def _atomic_write_json(path, obj):
+    """Write compact JSON to a temp file and swap it into place"""
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        f.write(json.dumps(obj, separators=(",", ":")))
+    os.replace(tmp, path)
+
 def save_config(config):
     """Save configuration to file"""
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        _atomic_write_json(CONFIG_FILE, config)
     except Exception as e:
         print(f"Error saving config: {e}")
 
 app = Flask(__name__)
-message_queue = queue.Queue()  # Queue for passing messages to GUI
+message_queue = queue.Queue(maxsize=10000)  # Queue for passing messages to GUI
+
+def post_log(text):
+    """Queue a log entry for the GUI, dropping it if the GUI has fallen behind"""
+    try:
+        message_queue.put_nowait(text)
+    except queue.Full:
+        pass
+
+class UserTurnLock:
+    """Lock handed out in arrival order, so one user's turns run in sequence"""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._waiting = deque()
+        self._held = False
+        self.users = 0  # Threads holding or waiting; guarded by the bot's _locks_guard
+    
+    def acquire(self, timeout):
+        """Wait up to timeout seconds for our turn"""
+        with self._cond:
+            token = object()
+            self._waiting.append(token)
+            acquired = self._cond.wait_for(
+                lambda: not self._held and self._waiting[0] is token, timeout
+            )
+            self._waiting.remove(token)
+            if acquired:
+                self._held = True
+            else:
+                # The next waiter may be first in line now
+                self._cond.notify_all()
+            return acquired
+    
+    def release(self):
+        with self._cond:
+            self._held = False
+            self._cond.notify_all()
 
 class WhatsAppOpenAIBot:
     def __init__(self):
         self.config = load_config()
         self.conversations = {}  # Dictionary to store conversation history for each user
         self.load_api_key()
+        self._twilio = None  # Created on first use by load_twilio_client
         self.running = False
         self.server_thread = None
+        self._wsgi_server = None
         self.user_details = {} 
+        self._details_lock = threading.Lock()  # Guards user_details and its log
+        self._evicted = {}  # Evicted message contents awaiting summary, per user
+        self._name_cache = OrderedDict()  # LRU of resolved user names
+        self._name_lock = threading.Lock()
+        self._enc = None  # tiktoken encoding for self._enc_model
+        self._enc_model = None
+        self._tok_cache = {}
+        self._enc_lock = threading.Lock()  # Guards the background encoding load
+        self._enc_loading = False
+        self._enc_failures = 0
+        self._enc_retry_at = 0.0  # time.monotonic() before which loads are not retried
+        self._resp_cache = OrderedDict()  # LRU of replies to short conversations
+        self._resp_lock = threading.Lock()
+        self._ts_cache = (0, "")  # (epoch second, formatted timestamp)
+        self._locks = {}  # Per-user UserTurnLocks, dropped once no thread uses them
+        self._locks_guard = threading.Lock()
         self.load_user_details()
+        # Special commands, keyed on the lowercased message
+        self._commands = {
+            "!clear": self.clear_conversation,
+            "!help": lambda user_id: HELP_TEXT,
+            "!info": lambda user_id: self._render_info(),
+        }
+        # New users are appended here; the snapshot is only rewritten on exit.
+        # Line buffered, so each entry reaches the file in a single write
+        self._user_details_log = open(USER_DETAILS_LOG, 'a', buffering=1)
+        atexit.register(self._final_snapshot)
         
     def load_api_key(self):
         """Load API key from environment or config"""
@@ -88,41 +215,93 @@ class WhatsAppOpenAIBot:
             return True
         return False
     
+    def load_twilio_client(self):
+        """Create the Twilio client once if credentials are set"""
+        if not (TWILIO_SID and TWILIO_TOKEN):
+            return False
+        
+        try:
+            from twilio.rest import Client
+            self._twilio = Client(TWILIO_SID, TWILIO_TOKEN)
+            return True
+        except Exception as e:
+            print(f"Error creating Twilio client: {e}")
+            return False
+    
     def load_user_details(self):
-        """Load saved user details"""
-        user_file = os.path.join(os.path.dirname(__file__), "user_details.json")
-        if os.path.exists(user_file):
+        """Load saved user details from the snapshot and replay the append log"""
+        if os.path.exists(USER_DETAILS_FILE):
             try:
-                with open(user_file, 'r') as f:
+                with open(USER_DETAILS_FILE, 'r') as f:
                     self.user_details = json.load(f)
             except Exception as e:
                 print(f"Error loading user details: {e}")
+        
+        if os.path.exists(USER_DETAILS_LOG):
+            try:
+                with open(USER_DETAILS_LOG, 'r') as f:
+                    lines = f.readlines()
+                for line in lines:
+                    if line.strip():
+                        self.user_details.update(json.loads(line))
+            except Exception as e:
+                print(f"Error loading user details log: {e}")
     
-    def save_user_details(self):
-        """Save user details"""
-        user_file = os.path.join(os.path.dirname(__file__), "user_details.json")
+    def save_user_details(self, user_id, name):
+        """Record a user and append the entry to the user details log"""
+        with self._name_lock:
+            self._name_cache.pop(user_id, None)
+        with self._details_lock:
+            self.user_details[user_id] = name
+            if self._user_details_log is None:
+                return
+            try:
+                self._user_details_log.write(json.dumps({user_id: name}) + "\n")
+            except Exception as e:
+                print(f"Error saving user details: {e}")
+    
+    def _final_snapshot(self):
+        """Write the consolidated user details once and truncate the log"""
+        # Webhook threads may still be running, so snapshot under the lock
+        with self._details_lock:
+            log, self._user_details_log = self._user_details_log, None
+            details = dict(self.user_details)
         try:
-            with open(user_file, 'w') as f:
-                json.dump(self.user_details, f, indent=2)
+            log.close()
+            _atomic_write_json(USER_DETAILS_FILE, details)
+            open(USER_DETAILS_LOG, 'w').close()
         except Exception as e:
             print(f"Error saving user details: {e}")
     
     def get_user_name(self, user_id):
-        """Get user name from phone number"""
+        """Get user name from phone number, served from an LRU cache"""
+        with self._name_lock:
+            name = self._name_cache.get(user_id)
+            if name is not None:
+                self._name_cache.move_to_end(user_id)
+                return name
+        
+        name = self._resolve_user_name(user_id)
+        with self._name_lock:
+            self._name_cache[user_id] = name
+            if len(self._name_cache) > NAME_CACHE_SIZE:
+                self._name_cache.popitem(last=False)
+        return name
+    
+    def _resolve_user_name(self, user_id):
+        """Look up a user name from saved details or Twilio"""
         if user_id in self.user_details:
             return self.user_details[user_id]
         
         phone = user_id.replace('whatsapp:', '')
         
-        twilio_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        twilio_token = os.getenv("TWILIO_AUTH_TOKEN")
+        if self._twilio is None and TWILIO_SID and TWILIO_TOKEN:
+            self.load_twilio_client()
         
-        if twilio_sid and twilio_token:
+        if self._twilio is not None:
             try:
-                client = Client(twilio_sid, twilio_token)
                 name = phone
-                self.user_details[user_id] = name
-                self.save_user_details()
+                self.save_user_details(user_id, name)
                 return name
             except Exception:
                 pass
@@ -132,100 +311,300 @@ class WhatsAppOpenAIBot:
     def get_conversation_history(self, user_id):
         """Get conversation history for a specific user"""
         if user_id not in self.conversations:
-            self.conversations[user_id] = [
-                {"role": "system", "content": "You are a helpful assistant responding via WhatsApp."}
-            ]
+            self.conversations[user_id] = deque([SYSTEM_MESSAGE], maxlen=MAX_HISTORY)
         return self.conversations[user_id]
     
     def clear_conversation(self, user_id):
         """Clear conversation history for a specific user"""
         if user_id in self.conversations:
-            self.conversations[user_id] = [
-                {"role": "system", "content": "You are a helpful assistant responding via WhatsApp."}
-            ]
+            self.conversations[user_id] = deque([SYSTEM_MESSAGE], maxlen=MAX_HISTORY)
+            self._evicted.pop(user_id, None)
             return "Conversation history cleared. What would you like to talk about?"
         return "No conversation history found."
     
+    def _encoding(self):
+        """Get the tiktoken encoding for the configured model, or None until it has loaded"""
+        if tiktoken is None:
+            return None
+        
+        model = self.config.get("model", "gpt-3.5-turbo")
+        if self._enc_model == model:
+            return self._enc
+        
+        # The first load can download the BPE file, so it never runs on the caller's thread
+        with self._enc_lock:
+            if not self._enc_loading and time.monotonic() >= self._enc_retry_at:
+                self._enc_loading = True
+                threading.Thread(target=self._load_encoding, args=(model,), daemon=True).start()
+        return None
+    
+    def _load_encoding(self, model):
+        """Load a tiktoken encoding, backing off exponentially after failures"""
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            with self._enc_lock:
+                self._enc_failures += 1
+                delay = min(ENCODING_RETRY_MAX, ENCODING_RETRY_BASE * 2 ** (self._enc_failures - 1))
+                self._enc_retry_at = time.monotonic() + delay
+                self._enc_loading = False
+            print(f"Error loading tiktoken encoding, estimating tokens for {delay}s: {e}")
+            return
+        
+        with self._enc_lock:
+            self._tok_cache = {}
+            self._enc = encoding
+            self._enc_model = model
+            self._enc_failures = 0
+            self._enc_loading = False
+    
+    def _count_tokens(self, text):
+        """Count the tokens of a message, estimating if tiktoken is unavailable"""
+        encoding = self._encoding()
+        if encoding is None:
+            return len(text) // 4
+        
+        count = self._tok_cache.get(text)
+        if count is None:
+            if len(self._tok_cache) >= TOKEN_CACHE_SIZE:
+                self._tok_cache.clear()
+            count = len(encoding.encode(text))
+            self._tok_cache[text] = count
+        return count
+    
+    def _token_budget(self):
+        """Prompt token budget for the configured model, leaving room for the reply"""
+        context = MODEL_CTX.get(self.config.get("model"), DEFAULT_CTX)
+        return int(0.8 * context) - self.config.get("max_tokens", 1000)
+    
+    def _first_evictable(self, conversation):
+        """Index of the oldest message that may be evicted"""
+        if len(conversation) > 1 and conversation[1]["content"].startswith(SUMMARY_PREFIX) \
+                and conversation[1]["role"] == "system":
+            return 2
+        return 1
+    
+    def _evict_oldest(self, user_id, conversation):
+        """Drop the oldest non-system message, summarizing every SUMMARY_EVERY evictions"""
+        index = self._first_evictable(conversation)
+        pending = self._evicted.setdefault(user_id, [])
+        pending.append(conversation[index]["content"])
+        del conversation[index]
+        
+        if len(pending) >= SUMMARY_EVERY:
+            # Extend the previous summary, keeping the most recent text
+            parts = list(pending)
+            if index == 2:
+                parts.insert(0, conversation[1]["content"][len(SUMMARY_PREFIX):])
+            summary = {"role": "system", "content": SUMMARY_PREFIX + " ".join(parts)[-SUMMARY_CHARS:]}
+            if index == 2:
+                conversation[1] = summary
+            else:
+                conversation.insert(1, summary)
+            pending.clear()
+    
+    def _append_message(self, user_id, conversation, message):
+        """Append a message, evicting the oldest non-system messages when full"""
+        while len(conversation) >= conversation.maxlen:
+            self._evict_oldest(user_id, conversation)
+        conversation.append(message)
+    
+    def _trim_to_budget(self, user_id, conversation):
+        """Evict the oldest messages until the prompt fits the token budget"""
+        budget = self._token_budget()
+        # The latest message is always kept
+        while self._first_evictable(conversation) < len(conversation) - 1:
+            tokens = sum(self._count_tokens(m["content"]) for m in conversation) \
+                - self._count_tokens(conversation[0]["content"])
+            if tokens <= budget:
+                break
+            self._evict_oldest(user_id, conversation)
+    
+    def _response_cache_key(self, conversation):
+        """Hash the request for the response cache, or None to bypass it"""
+        if len(conversation) > RESPONSE_CACHE_MAX_HISTORY:
+            return None
+        payload = [
+            self.config.get("model", "gpt-3.5-turbo"),
+            self.config.get("temperature", 0.7),
+            self.config.get("max_tokens", 1000),
+            list(conversation)
+        ]
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    def _cached_response(self, key):
+        """Get a cached reply for the key"""
+        if key is None:
+            return None
+        with self._resp_lock:
+            reply = self._resp_cache.get(key)
+            if reply is not None:
+                self._resp_cache.move_to_end(key)
+            return reply
+    
+    def _store_response(self, key, reply):
+        """Cache a reply, dropping the oldest beyond RESPONSE_CACHE_SIZE"""
+        if key is None:
+            return
+        with self._resp_lock:
+            self._resp_cache[key] = reply
+            if len(self._resp_cache) > RESPONSE_CACHE_SIZE:
+                self._resp_cache.popitem(last=False)
+    
+    def _now_str(self):
+        """Current local time as a log timestamp, formatted once per second"""
+        t = time.time()
+        epoch = int(t)
+        cached_epoch, stamp = self._ts_cache
+        if epoch != cached_epoch:
+            stamp = time.strftime(TIMESTAMP_FORMAT, time.localtime(t))
+            self._ts_cache = (epoch, stamp)
+        return stamp
+    
+    def _render_info(self):
+        """Render the current bot configuration for the !info command"""
+        return INFO_TEMPLATE.format(
+            model=self.config.get('model'),
+            temperature=self.config.get('temperature'),
+            max_tokens=self.config.get('max_tokens')
+        )
+    
+    def _checkout_lock(self, user_id):
+        """Get a user's turn lock, or None if too many messages are already pending"""
+        with self._locks_guard:
+            lock = self._locks.get(user_id)
+            if lock is None:
+                lock = self._locks[user_id] = UserTurnLock()
+            elif lock.users >= MAX_PENDING_PER_USER:
+                return None
+            lock.users += 1
+            return lock
+    
+    def _checkin_lock(self, user_id, lock):
+        """Drop a user's turn lock once no thread holds or waits on it"""
+        with self._locks_guard:
+            lock.users -= 1
+            if lock.users == 0:
+                del self._locks[user_id]
+    
     def process_message(self, user_id, user_message):
+        """Process incoming message, one whole turn at a time per user"""
+        lock = self._checkout_lock(user_id)
+        if lock is None:
+            post_log(f"[{self._now_str()}] Too many pending messages from {self.get_user_name(user_id)}")
+            return BUSY_TEXT
+        
+        try:
+            # Waiting longer than Twilio's webhook timeout is pointless
+            if not lock.acquire(timeout=self.config.get("request_timeout", 15)):
+                post_log(f"[{self._now_str()}] Timed out waiting on an earlier message from {self.get_user_name(user_id)}")
+                return BUSY_TEXT
+            try:
+                return self._process_message(user_id, user_message)
+            finally:
+                lock.release()
+        finally:
+            self._checkin_lock(user_id, lock)
+    
+    def _process_message(self, user_id, user_message):
         """Process incoming message and get response from OpenAI"""
+        timestamp = self._now_str()
+        logs = []  # Log lines are pushed to the GUI in batches
         try:
             # Get user name for logging
             user_name = self.get_user_name(user_id)
             
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            message_queue.put(f"[{timestamp}] Received from {user_name}: {user_message}")
+            logs.append(f"[{timestamp}] Received from {user_name}: {user_message}")
             
             # Check for special commands
-            if user_message.lower() == "!clear":
-                response = self.clear_conversation(user_id)
-                message_queue.put(f"[{timestamp}] Sent to {user_name}: {response}")
-                return response
-            
-            if user_message.lower() == "!help":
-                response = (
-                    "WhatsApp OpenAI Bot Help:\n"
-                    "- !clear: Clear conversation history\n"
-                    "- !help: Show this help message\n"
-                    "- !info: Show current bot configuration\n"
-                    "Just type a message to chat with the AI assistant!"
-                )
-                message_queue.put(f"[{timestamp}] Sent to {user_name}: {response}")
+            handler = self._commands.get(user_message.lower())
+            if handler:
+                response = handler(user_id)
+                logs.append(f"[{timestamp}] Sent to {user_name}: {response}")
+                post_log("\n".join(logs))
                 return response
             
-            if user_message.lower() == "!info":
-                response = (
-                    f"Bot Configuration:\n"
-                    f"- Model: {self.config.get('model')}\n"
-                    f"- Temperature: {self.config.get('temperature')}\n"
-                    f"- Max tokens: {self.config.get('max_tokens')}"
-                )
-                message_queue.put(f"[{timestamp}] Sent to {user_name}: {response}")
-                return response
             # Conversation histroy
             conversation = self.get_conversation_history(user_id)
             
             # Add user message to conversation history
-            conversation.append({"role": "user", "content": user_message})
+            self._append_message(user_id, conversation, {"role": "user", "content": user_message})
+            self._trim_to_budget(user_id, conversation)
+            messages = list(conversation)
             
             # Check if API key is set
             if not openai.api_key:
                 response = "⚠️ API key not set. Please contact the administrator."
-                message_queue.put(f"[{timestamp}] Sent to {user_name}: {response}")
+                logs.append(f"[{timestamp}] Sent to {user_name}: {response}")
+                post_log("\n".join(logs))
                 return response
             
-            # Log processing
-            message_queue.put(f"[{timestamp}] Processing request for {user_name}...")
+            # Log processing before the slow API call
+            logs.append(f"[{timestamp}] Processing request for {user_name}...")
+            post_log("\n".join(logs))
+            logs = []
             
-            # Call OpenAI API
-            response = openai.ChatCompletion.create(
-                model=self.config.get("model", "gpt-3.5-turbo"),
-                messages=conversation,
-                temperature=self.config.get("temperature", 0.7),
-                max_tokens=self.config.get("max_tokens", 1000)
-            )
+            # Short conversations can be answered from the cache
+            cache_key = self._response_cache_key(messages)
+            assistant_message = self._cached_response(cache_key)
             
-            # Extract and store response
-            assistant_message = response["choices"][0]["message"]["content"]
-            conversation.append({"role": "assistant", "content": assistant_message})
+            if assistant_message is None:
+                # Call OpenAI API. requests applies its timeout to each read of
+                # a stream, so reads get a third of the budget and no chunk is
+                # read past request_timeout minus one read; a final stalled
+                # read then still ends within request_timeout
+                request_timeout = self.config.get("request_timeout", 15)
+                read_timeout = request_timeout / 3
+                deadline = time.monotonic() + request_timeout - read_timeout
+                response = openai.ChatCompletion.create(
+                    model=self.config.get("model", "gpt-3.5-turbo"),
+                    messages=messages,
+                    temperature=self.config.get("temperature", 0.7),
+                    max_tokens=self.config.get("max_tokens", 1000),
+                    request_timeout=read_timeout,
+                    stream=True
+                )
+                parts = []
+                finish_reason = None
+                for chunk in response:
+                    if time.monotonic() > deadline:
+                        response.close()
+                        raise TimeoutError(f"OpenAI response took longer than {request_timeout}s")
+                    choice = chunk["choices"][0]
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    delta = choice["delta"].get("content")
+                    if not delta:
+                        continue
+                    if not parts:
+                        post_log(f"[{timestamp}] Streaming response to {user_name}...")
+                    parts.append(delta)
+                assistant_message = "".join(parts)
+                # Only complete replies are safe to serve to other users
+                if assistant_message and finish_reason == "stop":
+                    self._store_response(cache_key, assistant_message)
             
-            # Limit conversation history to prevent token limit issues
-            if len(conversation) > 20:  # Last 20 messages including system message
-                conversation = [conversation[0]] + conversation[-19:]
-                self.conversations[user_id] = conversation
+            # Store response
+            self._append_message(user_id, conversation, {"role": "assistant", "content": assistant_message})
             
             # Log response
-            message_queue.put(f"[{timestamp}] Sent to {user_name}: {assistant_message}")
+            logs.append(f"[{timestamp}] Sent to {user_name}: {assistant_message}")
+            post_log("\n".join(logs))
             
             return assistant_message
             
         except Exception as e:
             error_message = f"Error: {str(e)}"
             print(f"{error_message}\n{traceback.format_exc()}")
-            message_queue.put(f"[{timestamp}] ERROR: {error_message}")
+            logs.append(f"[{timestamp}] ERROR: {error_message}")
+            post_log("\n".join(logs))
             return f"Sorry, I encountered an error: {error_message}"
     
     def start_server(self):
-        """Start the Flask server in a separate thread"""
+        """Start the WSGI server in a separate thread"""
         if self.running:
             return False
         
@@ -233,40 +612,51 @@ class WhatsAppOpenAIBot:
             self.running = True
             port = self.config.get("server_port", 5000)
             
-            def run_server():
-                app.run(debug=False, use_reloader=False, host='0.0.0.0', port=port)
+            self._wsgi_server = create_server(app, host='0.0.0.0', port=port, threads=SERVER_THREADS)
             
-            self.server_thread = threading.Thread(target=run_server, daemon=True)
+            self.server_thread = threading.Thread(target=self._wsgi_server.run, daemon=True)
             self.server_thread.start()
-            message_queue.put(f"[INFO] Server started on port {port}")
+            post_log(f"[INFO] Server started on port {port}")
             return True
         except Exception as e:
             self.running = False
-            message_queue.put(f"[ERROR] Failed to start server: {str(e)}")
+            self._wsgi_server = None
+            post_log(f"[ERROR] Failed to start server: {str(e)}")
             return False
     
     def stop_server(self):
-        """Stop the Flask server"""
+        """Stop the WSGI server"""
         if not self.running:
             return
         
-        import requests
+        server, server_thread = self._wsgi_server, self.server_thread
         try:
-            port = self.config.get("server_port", 5000)
-            requests.get(f"http://localhost:{port}/shutdown")
-        except:
+            # Free the port right away so the server can be restarted
+            server.close()
+        except Exception:
             pass
         
+        self._wsgi_server = None
+        self.server_thread = None
         self.running = False
-        message_queue.put("[INFO] Server stopped")
-
-@app.route('/shutdown')
-def shutdown():
-    func = request.environ.get('werkzeug.server.shutdown')
-    if func is None:
-        raise RuntimeError('Not running with the Werkzeug Server')
-    func()
-    return 'Server shutting down...'
+        
+        # In-flight OpenAI calls can take seconds, so wait for them off the GUI thread
+        threading.Thread(target=self._teardown_server, args=(server, server_thread), daemon=True).start()
+    
+    def _teardown_server(self, server, server_thread):
+        """Close remaining channels and worker threads of a stopped server"""
+        try:
+            # close() leaves keep-alive channels being served and the worker
+            # threads running; waitress has no public API for either, so the
+            # server's own socket map is closed directly
+            wasyncore.close_all(server._map)
+            server.task_dispatcher.shutdown()
+        except Exception:
+            pass
+        
+        if server_thread is not None:
+            server_thread.join()
+        post_log("[INFO] Server stopped")
 
 # Create bot instance
 bot = WhatsAppOpenAIBot()
@@ -289,16 +679,27 @@ def whatsapp_webhook():
 
 class BotGUI:
     def __init__(self, root):
+        # GUI toolkits are only imported when a GUI is actually created
+        import customtkinter as ctk
+        from tkinter import messagebox
+        self._ctk = ctk
+        self._messagebox = messagebox
+        
         self.root = root
         self.root.title("WhatsApp OpenAI Bot")
         self.root.geometry("900x600")
+        self._save_after = None  # Pending debounced config save
+        self._user_btns = {}  # User list buttons by user_id
+        self._no_users_label = None
+        self._current_user = None  # User shown in the conversation view
+        self._rendered_tail = None  # Last message rendered for that user
         
         # Appearance mode
-        ctk.set_appearance_mode(bot.config.get("appearance_mode", "dark"))
-        ctk.set_default_color_theme("blue")
+        self._ctk.set_appearance_mode(bot.config.get("appearance_mode", "dark"))
+        self._ctk.set_default_color_theme("blue")
         
         # Main frame
-        self.main_frame = ctk.CTkFrame(self.root)
+        self.main_frame = self._ctk.CTkFrame(self.root)
         self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Header
@@ -307,8 +708,8 @@ class BotGUI:
         self.create_tabs()
         
         # Status bar
-        self.status_var = ctk.StringVar(value="Ready")
-        self.status_bar = ctk.CTkLabel(
+        self.status_var = self._ctk.StringVar(value="Ready")
+        self.status_bar = self._ctk.CTkLabel(
             self.root, 
             textvariable=self.status_var,
             anchor="w",
@@ -321,19 +722,19 @@ class BotGUI:
     
     def create_header(self):
         """Create header with title and controls"""
-        header_frame = ctk.CTkFrame(self.main_frame)
+        header_frame = self._ctk.CTkFrame(self.main_frame)
         header_frame.pack(fill="x", pady=(0, 10))
         
         # Title
-        title_label = ctk.CTkLabel(
+        title_label = self._ctk.CTkLabel(
             header_frame, 
             text="WhatsApp OpenAI Bot", 
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self._ctk.CTkFont(size=20, weight="bold")
         )
         title_label.pack(side="left", padx=10, pady=10)
         
         # Server controls
-        self.server_btn = ctk.CTkButton(
+        self.server_btn = self._ctk.CTkButton(
             header_frame,
             text="Start Server",
             command=self.toggle_server,
@@ -342,8 +743,8 @@ class BotGUI:
         self.server_btn.pack(side="right", padx=10, pady=10)
         
         # Appearance switch
-        appearance_var = ctk.StringVar(value=bot.config.get("appearance_mode", "dark"))
-        appearance_switch = ctk.CTkSwitch(
+        appearance_var = self._ctk.StringVar(value=bot.config.get("appearance_mode", "dark"))
+        appearance_switch = self._ctk.CTkSwitch(
             header_frame,
             text="Dark Mode",
             onvalue="dark",
@@ -355,7 +756,7 @@ class BotGUI:
     
     def create_tabs(self):
         """Create tabbed interface"""
-        self.tabview = ctk.CTkTabview(self.main_frame)
+        self.tabview = self._ctk.CTkTabview(self.main_frame)
         self.tabview.pack(fill="both", expand=True)
         
         # Tabs
@@ -376,17 +777,17 @@ class BotGUI:
         tab = self.tabview.tab("Dashboard")
         
         # Log area
-        log_frame = ctk.CTkFrame(tab)
+        log_frame = self._ctk.CTkFrame(tab)
         log_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        log_label = ctk.CTkLabel(
+        log_label = self._ctk.CTkLabel(
             log_frame, 
             text="Activity Log", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         log_label.pack(anchor="w", padx=10, pady=(10, 0))
         
-        self.log_text = ctk.CTkTextbox(
+        self.log_text = self._ctk.CTkTextbox(
             log_frame,
             wrap="word",
             height=400
@@ -394,10 +795,10 @@ class BotGUI:
         self.log_text.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Bottom controls
-        controls_frame = ctk.CTkFrame(tab)
+        controls_frame = self._ctk.CTkFrame(tab)
         controls_frame.pack(fill="x", padx=10, pady=(0, 10))
         
-        clear_log_btn = ctk.CTkButton(
+        clear_log_btn = self._ctk.CTkButton(
             controls_frame,
             text="Clear Log",
             command=self.clear_logs,
@@ -410,36 +811,36 @@ class BotGUI:
         tab = self.tabview.tab("Conversations")
         
         # Splitview for user list and conversation content
-        self.split_frame = ctk.CTkFrame(tab)
+        self.split_frame = self._ctk.CTkFrame(tab)
         self.split_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # User list frame (left side)
-        user_frame = ctk.CTkFrame(self.split_frame, width=200)
+        user_frame = self._ctk.CTkFrame(self.split_frame, width=200)
         user_frame.pack(side="left", fill="y", padx=(0, 5), pady=0)
         user_frame.pack_propagate(False)  # Don't shrink
         
-        user_label = ctk.CTkLabel(
+        user_label = self._ctk.CTkLabel(
             user_frame, 
             text="Active Users", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         user_label.pack(anchor="w", padx=10, pady=(10, 0))
         
-        self.user_list = ctk.CTkScrollableFrame(user_frame)
+        self.user_list = self._ctk.CTkScrollableFrame(user_frame)
         self.user_list.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Conversation view frame (right side)
-        conv_frame = ctk.CTkFrame(self.split_frame)
+        conv_frame = self._ctk.CTkFrame(self.split_frame)
         conv_frame.pack(side="right", fill="both", expand=True, padx=(5, 0), pady=0)
         
-        self.conv_title = ctk.CTkLabel(
+        self.conv_title = self._ctk.CTkLabel(
             conv_frame, 
             text="Select a conversation", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         self.conv_title.pack(anchor="w", padx=10, pady=(10, 0))
         
-        self.conv_text = ctk.CTkTextbox(
+        self.conv_text = self._ctk.CTkTextbox(
             conv_frame,
             wrap="word",
             height=400
@@ -451,24 +852,35 @@ class BotGUI:
     
     def refresh_user_list(self):
         """Refresh the list of users with active conversations"""
-        for widget in self.user_list.winfo_children():
-            widget.destroy()
+        user_ids = list(bot.conversations)
+        current = set(user_ids)
         
         # No users 
-        if not bot.conversations:
-            no_users = ctk.CTkLabel(
-                self.user_list,
-                text="No active conversations",
-                text_color="gray"
-            )
-            no_users.pack(pady=10)
+        if not current:
+            if self._no_users_label is None:
+                self._no_users_label = self._ctk.CTkLabel(
+                    self.user_list,
+                    text="No active conversations",
+                    text_color="gray"
+                )
+                self._no_users_label.pack(pady=10)
             return
         
-        # Add buttons for each user
-        for user_id in bot.conversations:
+        if self._no_users_label is not None:
+            self._no_users_label.destroy()
+            self._no_users_label = None
+        
+        # Remove buttons for users that are gone
+        for user_id in set(self._user_btns) - current:
+            self._user_btns.pop(user_id).destroy()
+        
+        # Add buttons for new users only
+        for user_id in user_ids:
+            if user_id in self._user_btns:
+                continue
             user_name = bot.get_user_name(user_id)
             
-            user_btn = ctk.CTkButton(
+            user_btn = self._ctk.CTkButton(
                 self.user_list,
                 text=user_name,
                 command=lambda u=user_id: self.show_conversation(u),
@@ -479,32 +891,49 @@ class BotGUI:
                 hover_color=("gray75", "gray25")
             )
             user_btn.pack(fill="x", pady=2)
+            self._user_btns[user_id] = user_btn
     
     def show_conversation(self, user_id):
         """Display conversation for selected user"""
         user_name = bot.get_user_name(user_id)
         self.conv_title.configure(text=f"Conversation with {user_name}")
         
-        self.conv_text.delete("0.0", "end")
+        conversation = list(bot.get_conversation_history(user_id))
+        
+        # Re-selecting the same user only appends messages after the last one shown
+        start = None
+        if user_id == self._current_user:
+            for index in range(len(conversation) - 1, -1, -1):
+                if conversation[index] is self._rendered_tail:
+                    start = index + 1
+                    break
+        
+        if start is None:
+            start = 0
+            self.conv_text.delete("0.0", "end")
+            
+            clear_btn = self._ctk.CTkButton(
+                self.conv_text,
+                text="Clear Conversation",
+                command=lambda: self.clear_conversation(user_id),
+                width=150
+            )
+            self.conv_text.window_create("end", window=clear_btn)
+            # Messages are inserted before the button
+            self.conv_text.mark_set("messages_end", "1.0")
         
         # Display conversation
-        conversation = bot.get_conversation_history(user_id)
-        for message in conversation:
+        for message in conversation[start:]:
             if message["role"] == "system":
                 continue  
             
             if message["role"] == "user":
-                self.conv_text.insert("end", f"User: {message['content']}\n\n", "user")
+                self.conv_text.insert("messages_end", f"User: {message['content']}\n\n", "user")
             else:
-                self.conv_text.insert("end", f"Bot: {message['content']}\n\n", "bot")
+                self.conv_text.insert("messages_end", f"Bot: {message['content']}\n\n", "bot")
         
-        clear_btn = ctk.CTkButton(
-            self.conv_text,
-            text="Clear Conversation",
-            command=lambda: self.clear_conversation(user_id),
-            width=150
-        )
-        self.conv_text.window_create("end", window=clear_btn)
+        self._current_user = user_id
+        self._rendered_tail = conversation[-1]
     
     def clear_conversation(self, user_id):
         """Clear conversation for a specific user"""
@@ -516,25 +945,25 @@ class BotGUI:
         """Create settings tab"""
         tab = self.tabview.tab("Settings")
         
-        settings_frame = ctk.CTkFrame(tab)
+        settings_frame = self._ctk.CTkFrame(tab)
         settings_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # API Key section
-        api_frame = ctk.CTkFrame(settings_frame)
+        api_frame = self._ctk.CTkFrame(settings_frame)
         api_frame.pack(fill="x", padx=10, pady=10)
         
-        api_label = ctk.CTkLabel(
+        api_label = self._ctk.CTkLabel(
             api_frame, 
             text="API Settings", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         api_label.pack(anchor="w", padx=10, pady=(10, 0))
         
         # OpenAI API Key
-        openai_frame = ctk.CTkFrame(api_frame, fg_color="transparent")
+        openai_frame = self._ctk.CTkFrame(api_frame, fg_color="transparent")
         openai_frame.pack(fill="x", padx=10, pady=5)
         
-        openai_label = ctk.CTkLabel(openai_frame, text="OpenAI API Key:")
+        openai_label = self._ctk.CTkLabel(openai_frame, text="OpenAI API Key:")
         openai_label.pack(side="left", padx=(0, 10))
         
         # API key for display
@@ -544,8 +973,8 @@ class BotGUI:
         else:
             display_key = ""
         
-        self.api_var = ctk.StringVar(value=display_key)
-        api_entry = ctk.CTkEntry(
+        self.api_var = self._ctk.StringVar(value=display_key)
+        api_entry = self._ctk.CTkEntry(
             openai_frame,
             textvariable=self.api_var,
             width=300,
@@ -553,7 +982,7 @@ class BotGUI:
         )
         api_entry.pack(side="left", padx=5)
         
-        api_btn = ctk.CTkButton(
+        api_btn = self._ctk.CTkButton(
             openai_frame,
             text="Update",
             command=self.update_api_key,
@@ -562,21 +991,21 @@ class BotGUI:
         api_btn.pack(side="left", padx=5)
         
         # Twilio section
-        twilio_frame = ctk.CTkFrame(api_frame, fg_color="transparent")
+        twilio_frame = self._ctk.CTkFrame(api_frame, fg_color="transparent")
         twilio_frame.pack(fill="x", padx=10, pady=5)
         
-        twilio_label = ctk.CTkLabel(twilio_frame, text="Twilio Settings:")
+        twilio_label = self._ctk.CTkLabel(twilio_frame, text="Twilio Settings:")
         twilio_label.pack(anchor="w", padx=10, pady=(5, 0))
         
-        twilio_status = "✓ Configured" if os.getenv("TWILIO_ACCOUNT_SID") else "❌ Not Configured"
-        twilio_status_label = ctk.CTkLabel(
+        twilio_status = "✓ Configured" if TWILIO_SID else "❌ Not Configured"
+        twilio_status_label = self._ctk.CTkLabel(
             twilio_frame,
             text=f"Status: {twilio_status}",
-            text_color="green" if os.getenv("TWILIO_ACCOUNT_SID") else "red"
+            text_color="green" if TWILIO_SID else "red"
         )
         twilio_status_label.pack(anchor="w", padx=30, pady=0)
         
-        twilio_help = ctk.CTkLabel(
+        twilio_help = self._ctk.CTkLabel(
             twilio_frame,
             text="Twilio credentials must be set in .env file",
             text_color="gray"
@@ -584,25 +1013,25 @@ class BotGUI:
         twilio_help.pack(anchor="w", padx=30, pady=0)
         
         # Model settings
-        model_frame = ctk.CTkFrame(settings_frame)
+        model_frame = self._ctk.CTkFrame(settings_frame)
         model_frame.pack(fill="x", padx=10, pady=10)
         
-        model_label = ctk.CTkLabel(
+        model_label = self._ctk.CTkLabel(
             model_frame, 
             text="Model Settings", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         model_label.pack(anchor="w", padx=10, pady=(10, 0))
         
         # Model selection
-        model_select_frame = ctk.CTkFrame(model_frame, fg_color="transparent")
+        model_select_frame = self._ctk.CTkFrame(model_frame, fg_color="transparent")
         model_select_frame.pack(fill="x", padx=10, pady=5)
         
-        model_select_label = ctk.CTkLabel(model_select_frame, text="OpenAI Model:")
+        model_select_label = self._ctk.CTkLabel(model_select_frame, text="OpenAI Model:")
         model_select_label.pack(side="left", padx=(0, 10))
         
-        self.model_var = ctk.StringVar(value=bot.config.get("model", "gpt-3.5-turbo"))
-        model_dropdown = ctk.CTkOptionMenu(
+        self.model_var = self._ctk.StringVar(value=bot.config.get("model", "gpt-3.5-turbo"))
+        model_dropdown = self._ctk.CTkOptionMenu(
             model_select_frame,
             values=["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo-preview"],
             variable=self.model_var,
@@ -612,14 +1041,14 @@ class BotGUI:
         model_dropdown.pack(side="left", padx=5)
         
         # Temperature slider
-        temp_frame = ctk.CTkFrame(model_frame, fg_color="transparent")
+        temp_frame = self._ctk.CTkFrame(model_frame, fg_color="transparent")
         temp_frame.pack(fill="x", padx=10, pady=5)
         
-        temp_label = ctk.CTkLabel(temp_frame, text="Temperature:")
+        temp_label = self._ctk.CTkLabel(temp_frame, text="Temperature:")
         temp_label.pack(side="left", padx=(0, 10))
         
-        self.temp_value = ctk.DoubleVar(value=bot.config.get("temperature", 0.7))
-        temp_slider = ctk.CTkSlider(
+        self.temp_value = self._ctk.DoubleVar(value=bot.config.get("temperature", 0.7))
+        temp_slider = self._ctk.CTkSlider(
             temp_frame,
             from_=0.0,
             to=1.0,
@@ -630,18 +1059,18 @@ class BotGUI:
         )
         temp_slider.pack(side="left", padx=5)
         
-        temp_value_label = ctk.CTkLabel(temp_frame, textvariable=self.temp_value)
+        temp_value_label = self._ctk.CTkLabel(temp_frame, textvariable=self.temp_value)
         temp_value_label.pack(side="left", padx=5)
         
         # Max tokens slider
-        tokens_frame = ctk.CTkFrame(model_frame, fg_color="transparent")
+        tokens_frame = self._ctk.CTkFrame(model_frame, fg_color="transparent")
         tokens_frame.pack(fill="x", padx=10, pady=5)
         
-        tokens_label = ctk.CTkLabel(tokens_frame, text="Max Tokens:")
+        tokens_label = self._ctk.CTkLabel(tokens_frame, text="Max Tokens:")
         tokens_label.pack(side="left", padx=(0, 10))
         
-        self.tokens_value = ctk.IntVar(value=bot.config.get("max_tokens", 1000))
-        tokens_slider = ctk.CTkSlider(
+        self.tokens_value = self._ctk.IntVar(value=bot.config.get("max_tokens", 1000))
+        tokens_slider = self._ctk.CTkSlider(
             tokens_frame,
             from_=100,
             to=4000,
@@ -652,36 +1081,36 @@ class BotGUI:
         )
         tokens_slider.pack(side="left", padx=5)
         
-        tokens_value_label = ctk.CTkLabel(tokens_frame, textvariable=self.tokens_value)
+        tokens_value_label = self._ctk.CTkLabel(tokens_frame, textvariable=self.tokens_value)
         tokens_value_label.pack(side="left", padx=5)
         
         # Server settings
-        server_frame = ctk.CTkFrame(settings_frame)
+        server_frame = self._ctk.CTkFrame(settings_frame)
         server_frame.pack(fill="x", padx=10, pady=10)
         
-        server_label = ctk.CTkLabel(
+        server_label = self._ctk.CTkLabel(
             server_frame, 
             text="Server Settings", 
-            font=ctk.CTkFont(weight="bold")
+            font=self._ctk.CTkFont(weight="bold")
         )
         server_label.pack(anchor="w", padx=10, pady=(10, 0))
         
         # Port setting
-        port_frame = ctk.CTkFrame(server_frame, fg_color="transparent")
+        port_frame = self._ctk.CTkFrame(server_frame, fg_color="transparent")
         port_frame.pack(fill="x", padx=10, pady=5)
         
-        port_label = ctk.CTkLabel(port_frame, text="Server Port:")
+        port_label = self._ctk.CTkLabel(port_frame, text="Server Port:")
         port_label.pack(side="left", padx=(0, 10))
         
-        self.port_var = ctk.StringVar(value=str(bot.config.get("server_port", 5000)))
-        port_entry = ctk.CTkEntry(
+        self.port_var = self._ctk.StringVar(value=str(bot.config.get("server_port", 5000)))
+        port_entry = self._ctk.CTkEntry(
             port_frame,
             textvariable=self.port_var,
             width=100
         )
         port_entry.pack(side="left", padx=5)
         
-        port_btn = ctk.CTkButton(
+        port_btn = self._ctk.CTkButton(
             port_frame,
             text="Update",
             command=self.update_port,
@@ -689,10 +1118,10 @@ class BotGUI:
         )
         port_btn.pack(side="left", padx=5)
         
-        button_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        button_frame = self._ctk.CTkFrame(settings_frame, fg_color="transparent")
         button_frame.pack(fill="x", padx=10, pady=10)
         
-        restore_btn = ctk.CTkButton(
+        restore_btn = self._ctk.CTkButton(
             button_frame,
             text="Restore Defaults",
             command=self.restore_defaults,
@@ -702,7 +1131,7 @@ class BotGUI:
         )
         restore_btn.pack(side="left", padx=10, pady=10)
         
-        save_btn = ctk.CTkButton(
+        save_btn = self._ctk.CTkButton(
             button_frame,
             text="Save Settings",
             command=self.save_settings,
@@ -712,7 +1141,7 @@ class BotGUI:
     
     def update_api_key(self):
         """Update OpenAI API key"""
-        dialog = ctk.CTkInputDialog(
+        dialog = self._ctk.CTkInputDialog(
             text="Enter your OpenAI API Key:", 
             title="Set API Key"
         )
@@ -725,10 +1154,21 @@ class BotGUI:
             self.api_var.set(new_api_key[:4] + "..." + new_api_key[-4:])
             self.status_var.set("API key updated")
     
+    def _schedule_save(self):
+        """Save the config once slider/menu changes pause for 300 ms"""
+        if self._save_after:
+            self.root.after_cancel(self._save_after)
+        self._save_after = self.root.after(300, self._flush_save)
+    
+    def _flush_save(self):
+        """Run the pending debounced config save"""
+        self._save_after = None
+        save_config(bot.config)
+    
     def update_model(self, choice):
         """Update OpenAI model"""
         bot.config["model"] = choice
-        save_config(bot.config)
+        self._schedule_save()
         self.status_var.set(f"Model set to {choice}")
     
     def update_temperature(self, value):
@@ -736,14 +1176,14 @@ class BotGUI:
         rounded = round(float(value), 1)
         bot.config["temperature"] = rounded
         self.temp_value.set(rounded)
-        save_config(bot.config)
+        self._schedule_save()
     
     def update_tokens(self, value):
         """Update max tokens setting"""
         tokens = int(value)
         bot.config["max_tokens"] = tokens
         self.tokens_value.set(tokens)
-        save_config(bot.config)
+        self._schedule_save()
     
     def update_port(self):
         """Update server port"""
@@ -758,10 +1198,10 @@ class BotGUI:
             
             # Notify user to restart server
             if bot.running:
-                messagebox.showinfo(
+                self._messagebox.showinfo(
                     "Restart Required", 
                     "Please stop and restart the server for the port change to take effect."
                 )
                 
         except ValueError as e:
-            messagebox.shower
\ No newline at end of file
+            self._messagebox.shower
\ No newline at end of file